@@ -8,6 +8,15 @@
 #   - If moving left and p-d < 0, the new position is (p - d) % 100
 # 5. If the new position is 0, count it
 
+import sys
+from array import array
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 
 def parse_direction(instruction):
     direction = instruction[0]
@@ -48,13 +57,212 @@ def count_zero_positions(instructions):
     return zero_count
 
 
-def main():
-    with open("day_1_input.txt", "r") as file:
-        instructions = [line.strip() for line in file.readlines()]
+def parse_movement_bytes(buffer):
+    """
+    Parses newline-terminated instruction bytes into a signed int64 movement
+    array.
+
+    The directions and distances of every line are decoded with array
+    operations instead of three Python calls per line. Blank lines are
+    skipped and distances must fit in 18 digits.
+
+    Parameters:
+    buffer (bytes): Instructions such as b"L68\nR14\n".
+
+    Returns:
+    numpy.ndarray: Movements, negative for L and positive for R.
+    """
+    chars = np.frombuffer(buffer, dtype=np.uint8)
+    line_ends = np.flatnonzero(chars == ord("\n"))
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+
+    # Each digit contributes digit * 10 ** (digits left before the line end)
+    line_lengths = line_ends - line_starts + 1
+    owning_line_end = np.repeat(line_ends, line_lengths)
+
+    non_blank = line_ends > line_starts
+    line_starts = line_starts[non_blank]
+    if len(line_starts) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    directions = chars[line_starts]
+    is_right = directions == ord("R")
+    if not np.all(is_right | (directions == ord("L"))):
+        raise ValueError("Invalid direction; must be 'L' or 'R'")
+    if np.any(line_ends[non_blank] - line_starts < 2):
+        raise ValueError("Instruction is missing a distance")
+    if np.any(line_ends[non_blank] - line_starts > 19):
+        # 19 digits could overflow int64, so longer lines are left to int()
+        raise ValueError("Distance is too long; must fit in 18 digits")
+
+    # Everything that is neither a direction nor a line break must be a digit
+    is_digit = (chars >= ord("0")) & (chars <= ord("9"))
+    is_digit[line_starts] = False
+    expected = np.ones(len(chars), dtype=bool)
+    expected[line_starts] = False
+    expected[line_ends] = False
+    if not np.array_equal(is_digit, expected):
+        raise ValueError("Invalid distance; must be a non-negative integer")
+
+    exponents = owning_line_end - np.arange(len(chars)) - 1
+    exponents[~is_digit] = 0
+    values = np.where(
+        is_digit, (chars.astype(np.int64) - ord("0")) * 10 ** exponents, 0
+    )
+    distances = np.add.reduceat(values, line_starts)
+
+    return np.where(is_right, distances, -distances)
+
+
+def parse_movements(instructions):
+    """
+    Parses a whole list of instructions into a signed int64 movement array.
+
+    Parameters:
+    instructions (list): Instructions such as "L68" or "R14".
+
+    Returns:
+    numpy.ndarray: Movements, negative for L and positive for R.
+    """
+    if not instructions:
+        return np.zeros(0, dtype=np.int64)
+
+    try:
+        buffer = ("\n".join(instructions) + "\n").encode("ascii")
+    except (TypeError, UnicodeEncodeError):
+        raise ValueError("Instructions must be ASCII strings")
+
+    return parse_movement_bytes(buffer)
+
+
+def parse_movement_line(line):
+    direction = line[:1]
+    if direction == b"R":
+        return int(line[1:])
+    elif direction == b"L":
+        return -int(line[1:])
+    else:
+        raise ValueError("Invalid direction; must be 'L' or 'R'")
+
+
+def movements_from_bytes(buffer):
+    buffer = buffer.replace(b"\r", b"")
+    if HAS_NUMPY:
+        try:
+            return array("q", parse_movement_bytes(buffer).tobytes())
+        except ValueError:
+            # Lines with stray whitespace are parsed one by one below,
+            # which accepts the same lines as stripping each one
+            pass
+
+    movements = [
+        parse_movement_line(line.strip())
+        for line in buffer.split(b"\n")
+        if line.strip()
+    ]
+    try:
+        return array("q", movements)
+    except OverflowError:
+        # Distances beyond int64 stay as exact Python ints for this chunk
+        return movements
+
+
+def read_movement_chunks(path, chunk_size=1 << 20):
+    """
+    Reads an instruction log as raw bytes and yields array('q') buffers of
+    signed movements, so memory stays bounded by chunk_size no matter how
+    large the log is.
+
+    Parameters:
+    path (str): Path to the instruction log.
+    chunk_size (int): Number of bytes read from the file at a time.
+
+    Yields:
+    array: Signed movements for the complete lines in each chunk, or a list
+    of Python ints when a distance in the chunk does not fit in int64.
+    """
+    remainder = b""
+    with open(path, "rb") as file:
+        while True:
+            data = file.read(chunk_size)
+            if not data:
+                break
+
+            data = remainder + data
+            cut = data.rfind(b"\n") + 1
+            remainder = data[cut:]
+            if cut:
+                yield movements_from_bytes(data[:cut])
+
+    if remainder.strip():
+        yield movements_from_bytes(remainder + b"\n")
+
+
+def iter_movements(path, chunk_size=1 << 20):
+    for movements in read_movement_chunks(path, chunk_size):
+        yield from movements
+
+
+def count_zero_landings(movements, start=50):
+    """
+    Counts how many movements leave the dial on position 0.
+
+    Parameters:
+    movements (numpy.ndarray): Signed movements from parse_movements.
+    start (int): The starting dial position.
+
+    Returns:
+    int: The number of times the dial landed on 0.
+    """
+    positions = (start + np.cumsum(movements % 100)) % 100
+    return int(np.count_nonzero(positions == 0))
+
+
+def count_zero_positions_vectorized(instructions):
+    """
+    Same result as count_zero_positions, computed without a per-line loop.
+
+    Falls back to count_zero_positions when NumPy is not installed, or when
+    the batch parser rejects a line (e.g. a distance too long for int64).
+    """
+    if not HAS_NUMPY:
+        return count_zero_positions(instructions)
+    instructions = list(instructions)
+    try:
+        movements = parse_movements(instructions)
+    except ValueError:
+        return count_zero_positions(instructions)
+    return count_zero_landings(movements)
+
+
+def count_zero_positions_in_file(path, chunk_size=1 << 20):
+    """
+    Same result as count_zero_positions for the instructions in a log file,
+    streamed in chunks of raw bytes with constant memory.
+    """
+    position = 50
+    zero_count = 0
+
+    for movements in read_movement_chunks(path, chunk_size):
+        if not movements:
+            continue
+        if HAS_NUMPY and isinstance(movements, array):
+            chunk = np.frombuffer(movements, dtype=np.int64)
+            zero_count += count_zero_landings(chunk, start=position)
+            position = int((position + (chunk % 100).sum()) % 100)
+        else:
+            for movement in movements:
+                position = (position + movement) % 100
+                if position == 0:
+                    zero_count += 1
+
+    return zero_count
+
 
-    zero_count = count_zero_positions(instructions)
+def main(path="data/day_1_input.txt"):
+    zero_count = count_zero_positions_in_file(path)
     print(f"The lock landed on position 0 a total of {zero_count} times.")
 
 
 if __name__ == "__main__":
-    main()
+    main(*sys.argv[1:])
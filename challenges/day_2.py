@@ -9,6 +9,19 @@
 # 5. If the new position is 0, count it
 # 6. If the dial passes 0 at any point during the move, count it
 
+import json
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 
 def parse_direction(instruction):
     direction = instruction[0]
@@ -78,14 +91,473 @@ def count_zero_positions(instructions):
     return zero_count
 
 
-def main():
-    with open("day_1_input.txt", "r") as file:
-        instructions = [line.strip() for line in file.readlines()]
+def parse_movement_bytes(buffer):
+    """
+    Parses newline-terminated instruction bytes into a signed int64 movement
+    array.
+
+    The directions and distances of every line are decoded with array
+    operations instead of three Python calls per line. Blank lines are
+    skipped and distances must fit in 18 digits.
+
+    Parameters:
+    buffer (bytes): Instructions such as b"L68\nR14\n".
+
+    Returns:
+    numpy.ndarray: Movements, negative for L and positive for R.
+    """
+    chars = np.frombuffer(buffer, dtype=np.uint8)
+    line_ends = np.flatnonzero(chars == ord("\n"))
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+
+    # Each digit contributes digit * 10 ** (digits left before the line end)
+    line_lengths = line_ends - line_starts + 1
+    owning_line_end = np.repeat(line_ends, line_lengths)
+
+    non_blank = line_ends > line_starts
+    line_starts = line_starts[non_blank]
+    if len(line_starts) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    directions = chars[line_starts]
+    is_right = directions == ord("R")
+    if not np.all(is_right | (directions == ord("L"))):
+        raise ValueError("Invalid direction; must be 'L' or 'R'")
+    if np.any(line_ends[non_blank] - line_starts < 2):
+        raise ValueError("Instruction is missing a distance")
+    if np.any(line_ends[non_blank] - line_starts > 19):
+        # 19 digits could overflow int64, so longer lines are left to int()
+        raise ValueError("Distance is too long; must fit in 18 digits")
+
+    # Everything that is neither a direction nor a line break must be a digit
+    is_digit = (chars >= ord("0")) & (chars <= ord("9"))
+    is_digit[line_starts] = False
+    expected = np.ones(len(chars), dtype=bool)
+    expected[line_starts] = False
+    expected[line_ends] = False
+    if not np.array_equal(is_digit, expected):
+        raise ValueError("Invalid distance; must be a non-negative integer")
+
+    exponents = owning_line_end - np.arange(len(chars)) - 1
+    exponents[~is_digit] = 0
+    values = np.where(
+        is_digit, (chars.astype(np.int64) - ord("0")) * 10 ** exponents, 0
+    )
+    distances = np.add.reduceat(values, line_starts)
+
+    return np.where(is_right, distances, -distances)
+
+
+def parse_movements(instructions):
+    """
+    Parses a whole list of instructions into a signed int64 movement array.
+
+    Parameters:
+    instructions (list): Instructions such as "L68" or "R14".
+
+    Returns:
+    numpy.ndarray: Movements, negative for L and positive for R.
+    """
+    if not instructions:
+        return np.zeros(0, dtype=np.int64)
+
+    try:
+        buffer = ("\n".join(instructions) + "\n").encode("ascii")
+    except (TypeError, UnicodeEncodeError):
+        raise ValueError("Instructions must be ASCII strings")
+
+    return parse_movement_bytes(buffer)
+
+
+def parse_movement_line(line):
+    direction = line[:1]
+    if direction == b"R":
+        return int(line[1:])
+    elif direction == b"L":
+        return -int(line[1:])
+    else:
+        raise ValueError("Invalid direction; must be 'L' or 'R'")
+
+
+def movements_from_bytes(buffer):
+    buffer = buffer.replace(b"\r", b"")
+    if HAS_NUMPY:
+        try:
+            return array("q", parse_movement_bytes(buffer).tobytes())
+        except ValueError:
+            # Lines with stray whitespace are parsed one by one below,
+            # which accepts the same lines as stripping each one
+            pass
+
+    movements = [
+        parse_movement_line(line.strip())
+        for line in buffer.split(b"\n")
+        if line.strip()
+    ]
+    try:
+        return array("q", movements)
+    except OverflowError:
+        # Distances beyond int64 stay as exact Python ints for this chunk
+        return movements
+
+
+def read_movement_chunks(path, chunk_size=1 << 20):
+    """
+    Reads an instruction log as raw bytes and yields array('q') buffers of
+    signed movements, so memory stays bounded by chunk_size no matter how
+    large the log is.
+
+    Parameters:
+    path (str): Path to the instruction log.
+    chunk_size (int): Number of bytes read from the file at a time.
+
+    Yields:
+    array: Signed movements for the complete lines in each chunk, or a list
+    of Python ints when a distance in the chunk does not fit in int64.
+    """
+    remainder = b""
+    with open(path, "rb") as file:
+        while True:
+            data = file.read(chunk_size)
+            if not data:
+                break
+
+            data = remainder + data
+            cut = data.rfind(b"\n") + 1
+            remainder = data[cut:]
+            if cut:
+                yield movements_from_bytes(data[:cut])
+
+    if remainder.strip():
+        yield movements_from_bytes(remainder + b"\n")
+
+
+def iter_movements(path, chunk_size=1 << 20):
+    for movements in read_movement_chunks(path, chunk_size):
+        yield from movements
+
+
+def count_zero_crossings(movements, start=50):
+    """
+    Counts every click that lands on 0, including those mid-movement.
+
+    Each move passes 0 once per full lap of 100 clicks, and its remaining
+    clicks reach 0 at most once more depending on where the move started.
+    Start positions come from a cumulative sum of the movements modulo 100,
+    so every intermediate value stays small whatever the distances are.
+
+    Parameters:
+    movements (numpy.ndarray): Signed movements from parse_movements.
+    start (int): The starting dial position.
+
+    Returns:
+    int: The number of times the dial pointed at 0.
+    """
+    if len(movements) == 0:
+        return 0
+
+    distances = np.abs(movements)
+    laps = distances // 100
+    remainders = distances % 100
+
+    after = (start + np.cumsum(movements % 100)) % 100
+    before = np.concatenate(([start % 100], after[:-1]))
+
+    right_hits = before + remainders >= 100
+    left_hits = (before > 0) & (remainders >= before)
+    extra_hits = np.where(movements >= 0, right_hits, left_hits)
+
+    # Laps can reach 10 ** 16 per move, so only sum them in int64 when safe
+    if int(laps.max()) * len(laps) > np.iinfo(np.int64).max:
+        total_laps = sum(laps.tolist())
+    else:
+        total_laps = int(laps.sum())
+    return total_laps + int(np.count_nonzero(extra_hits))
+
+
+def count_zero_positions_vectorized(instructions):
+    """
+    Same result as count_zero_positions, computed without a per-line loop.
+
+    Falls back to count_zero_positions when NumPy is not installed, or when
+    the batch parser rejects a line (e.g. a distance too long for int64).
+    """
+    if instructions is None:
+        raise ValueError("Instructions cannot be None")
+    if not HAS_NUMPY:
+        return count_zero_positions(instructions)
+    # Materialised once, since the None scan would otherwise use up iterators
+    instructions = list(instructions)
+    if any(instruction is None for instruction in instructions):
+        raise ValueError("Instruction cannot be None")
+    try:
+        movements = parse_movements(instructions)
+    except ValueError:
+        return count_zero_positions(instructions)
+    return count_zero_crossings(movements)
+
+
+# A block of instructions can be summarized independently of where the dial
+# starts: the net offset it applies, and how many zero hits it produces for
+# each of the 100 possible starting positions. Two summaries compose by
+# feeding the first block's end position into the second, which makes the
+# summary associative and lets blocks be evaluated in any grouping.
+
+
+def zero_hits_for_movement(position, movement):
+    if movement >= 0:
+        return (position + movement) // 100
+    else:
+        return (position - 1) // 100 - (position + movement - 1) // 100
+
+
+class DialSummary:
+    def __init__(self, offset, hits):
+        # offset: net movement of the block, modulo 100
+        # hits[p]: zero hits produced by the block when starting at p
+        self.offset = offset
+        self.hits = hits
+
+    @classmethod
+    def identity(cls):
+        return cls(0, (0,) * 100)
+
+    @classmethod
+    def from_instruction(cls, instruction):
+        direction = parse_direction(instruction)
+        distance = parse_distance(instruction)
+        movement = translate_direction_into_movement(direction, distance)
+        hits = tuple(
+            zero_hits_for_movement(position, movement) for position in range(100)
+        )
+        return cls(movement % 100, hits)
+
+    def compose(self, other):
+        """Summary of running this block followed by the other block."""
+        hits = tuple(
+            self.hits[p] + other.hits[(p + self.offset) % 100] for p in range(100)
+        )
+        return DialSummary((self.offset + other.offset) % 100, hits)
+
+    def zero_hits(self, start=50):
+        return self.hits[start % 100]
+
+    def end_position(self, start=50):
+        return (start + self.offset) % 100
+
+
+def summarize_instructions(instructions):
+    summary = DialSummary.identity()
+    for instruction in instructions:
+        if instruction is None:
+            raise ValueError("Instruction cannot be None")
+        summary = summary.compose(DialSummary.from_instruction(instruction))
+    return summary
+
+
+def summarize_in_parallel(instructions, workers=None, chunk_size=100_000):
+    """
+    Summarizes the instructions by splitting them into chunks that are
+    summarized in a process pool and then composed in order.
+
+    Parameters:
+    instructions (list): Instructions such as "L68" or "R14".
+    workers (int): Number of worker processes (defaults to the CPU count).
+    chunk_size (int): Instructions per chunk sent to a worker.
+
+    Returns:
+    DialSummary: The summary of the whole instruction list.
+    """
+    if instructions is None:
+        raise ValueError("Instructions cannot be None")
+
+    chunks = [
+        instructions[i : i + chunk_size]
+        for i in range(0, len(instructions), chunk_size)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        summaries = executor.map(summarize_instructions, chunks)
+        return reduce(DialSummary.compose, summaries, DialSummary.identity())
+
+
+class DialSegmentTree:
+    def __init__(self, instructions):
+        if instructions is None:
+            raise ValueError("Instructions cannot be None")
+
+        self.size = len(instructions)
+        self.nodes = [DialSummary.identity()] * (2 * self.size)
+        for i, instruction in enumerate(instructions):
+            if instruction is None:
+                raise ValueError("Instruction cannot be None")
+            self.nodes[self.size + i] = DialSummary.from_instruction(instruction)
+        for i in range(self.size - 1, 0, -1):
+            self.nodes[i] = self.nodes[2 * i].compose(self.nodes[2 * i + 1])
+
+    def update(self, index, instruction):
+        if not 0 <= index < self.size:
+            raise IndexError("Instruction index out of bounds")
+        if instruction is None:
+            raise ValueError("Instruction cannot be None")
+
+        i = self.size + index
+        self.nodes[i] = DialSummary.from_instruction(instruction)
+        i //= 2
+        while i >= 1:
+            self.nodes[i] = self.nodes[2 * i].compose(self.nodes[2 * i + 1])
+            i //= 2
+
+    def query(self, start_index, end_index, position=50):
+        """
+        Counts zero hits for instructions[start_index:end_index] when the
+        dial starts at the given position, visiting O(log n) nodes.
+
+        Returns:
+        tuple: (zero hits, dial position after the range)
+        """
+        if not 0 <= start_index <= end_index <= self.size:
+            raise IndexError("Instruction range out of bounds")
+
+        # Nodes covering the range, gathered so they can be applied in order
+        left_nodes = []
+        right_nodes = []
+        lo = start_index + self.size
+        hi = end_index + self.size
+        while lo < hi:
+            if lo % 2 == 1:
+                left_nodes.append(self.nodes[lo])
+                lo += 1
+            if hi % 2 == 1:
+                hi -= 1
+                right_nodes.append(self.nodes[hi])
+            lo //= 2
+            hi //= 2
+
+        zero_count = 0
+        position %= 100
+        for node in left_nodes + right_nodes[::-1]:
+            zero_count += node.zero_hits(position)
+            position = node.end_position(position)
+        return zero_count, position
+
+
+# For an append-only log the tracker keeps the running dial state, so each
+# refresh only processes lines that were appended since the last one. The
+# state is small enough to checkpoint as JSON next to the log.
+
+
+class DialTracker:
+    def __init__(self, position=50, zero_landings=0, zero_crossings=0, file_offset=0):
+        self.position = position
+        self.zero_landings = zero_landings  # part 1: moves ending on 0
+        self.zero_crossings = zero_crossings  # part 2: every click on 0
+        self.file_offset = file_offset  # bytes of the log already consumed
+
+    def feed(self, instructions):
+        if instructions is None:
+            raise ValueError("Instructions cannot be None")
+
+        # Parse the whole batch before touching the state, so a bad line
+        # leaves the tracker exactly as it was
+        movements = []
+        for instruction in instructions:
+            if instruction is None:
+                raise ValueError("Instruction cannot be None")
+
+            direction = parse_direction(instruction)
+            distance = parse_distance(instruction)
+            movements.append(translate_direction_into_movement(direction, distance))
+
+        for movement in movements:
+            self.zero_crossings += zero_hits_for_movement(self.position, movement)
+            self.position = (self.position + movement) % 100
+            if self.position == 0:
+                self.zero_landings += 1
+
+    def consume_file(self, path, chunk_size=1 << 20):
+        """
+        Feeds the complete lines appended to the log since the last call,
+        reading chunk_size bytes at a time. A trailing line without a
+        newline is left for the next refresh.
+        """
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < self.file_offset:
+                raise ValueError(
+                    "Log is shorter than the checkpoint offset; "
+                    "it was truncated or rotated"
+                )
+            file.seek(self.file_offset)
+
+            remainder = b""
+            while True:
+                data = file.read(chunk_size)
+                if not data:
+                    break
+
+                data = remainder + data
+                cut = data.rfind(b"\n") + 1
+                remainder = data[cut:]
+                if cut:
+                    lines = data[:cut].decode("ascii").split("\n")
+                    self.feed(line.strip() for line in lines if line.strip())
+                    self.file_offset += cut
+
+    def to_checkpoint(self):
+        return json.dumps(
+            {
+                "position": self.position,
+                "zero_landings": self.zero_landings,
+                "zero_crossings": self.zero_crossings,
+                "file_offset": self.file_offset,
+            }
+        )
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint):
+        return cls(**json.loads(checkpoint))
+
+    def save(self, path):
+        # Written beside the old checkpoint and swapped in, so a crash
+        # mid-write never leaves a half-written checkpoint behind
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as file:
+            file.write(self.to_checkpoint())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as file:
+            return cls.from_checkpoint(file.read())
+
+
+def count_zero_positions_in_file(path, chunk_size=1 << 20):
+    """
+    Same result as count_zero_positions for the instructions in a log file,
+    streamed in chunks of raw bytes with constant memory.
+    """
+    position = 50
+    zero_count = 0
+
+    for movements in read_movement_chunks(path, chunk_size):
+        if not movements:
+            continue
+        if HAS_NUMPY and isinstance(movements, array):
+            chunk = np.frombuffer(movements, dtype=np.int64)
+            zero_count += count_zero_crossings(chunk, start=position)
+            position = int((position + (chunk % 100).sum()) % 100)
+        else:
+            for movement in movements:
+                zero_count += zero_hits_for_movement(position, movement)
+                position = (position + movement) % 100
+
+    return zero_count
+
 
-    zero_count = count_zero_positions(instructions)
+def main(path="data/day_1_input.txt"):
+    zero_count = count_zero_positions_in_file(path)
 
     print(f"The lock landed on position 0 a total of {zero_count} times.")
 
 
 if __name__ == "__main__":
-    main()
+    main(*sys.argv[1:])
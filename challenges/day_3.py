@@ -6,6 +6,11 @@
 # 5. Next task: sum all the invalid IDs found in the ranges.
 # 6. Note: no invalid IDs start with a 0.
 
+from array import array
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from itertools import accumulate
+
 
 def read_file_and_turn_to_list(file_path):
     with open(file_path, "r") as file:
@@ -37,6 +42,68 @@ def find_invalid_ids_in_range(start, end):
     return invalid_ids
 
 
+# Every invalid ID is a block of digits written out several times, which is
+# the block multiplied by a repunit-style multiplier: 1234 * 10001 = 12341234
+# and 12 * 10101 = 121212. Instead of testing every integer in a range, the
+# candidates can be generated directly from the blocks that land in it.
+
+
+def repeated_block_bounds(start, end, block_length, repeats):
+    """
+    Returns (multiplier, lowest_block, highest_block) for the IDs in
+    [start, end] made of a block_length-digit block repeated the given
+    number of times. The bounds are empty when lowest_block > highest_block.
+    """
+    multiplier = (10 ** (block_length * repeats) - 1) // (10**block_length - 1)
+    lowest_block = max(10 ** (block_length - 1), -(-start // multiplier))
+    highest_block = min(10**block_length - 1, end // multiplier)
+    return multiplier, lowest_block, highest_block
+
+
+def repeated_block_ids(start, end, block_length, repeats):
+    """
+    Returns the IDs in [start, end] made of a block_length-digit block
+    repeated the given number of times, as an ascending range.
+    """
+    multiplier, lowest_block, highest_block = repeated_block_bounds(
+        start, end, block_length, repeats
+    )
+    return range(lowest_block * multiplier, highest_block * multiplier + 1, multiplier)
+
+
+def sum_repeated_block_ids(start, end, block_length, repeats):
+    """Sums repeated_block_ids in closed form as an arithmetic series."""
+    multiplier, lowest_block, highest_block = repeated_block_bounds(
+        start, end, block_length, repeats
+    )
+    if lowest_block > highest_block:
+        return 0
+    block_count = highest_block - lowest_block + 1
+    return multiplier * (lowest_block + highest_block) * block_count // 2
+
+
+def generate_invalid_ids_in_range(start, end):
+    """
+    Same result as find_invalid_ids_in_range, built from the repeated blocks
+    of each even digit length so the work is proportional to the number of
+    invalid IDs rather than the width of the range.
+    """
+    invalid_ids = []
+    for length in range(len(str(start)), len(str(end)) + 1):
+        if length % 2 == 0:
+            invalid_ids.extend(repeated_block_ids(start, end, length // 2, 2))
+    return invalid_ids
+
+
+def sum_invalid_ids_in_range(start, end):
+    """Same as sum(find_invalid_ids_in_range(start, end)), in O(digits)."""
+    total = 0
+    for length in range(len(str(start)), len(str(end)) + 1):
+        if length % 2 == 0:
+            total += sum_repeated_block_ids(start, end, length // 2, 2)
+    return total
+
+
 def sum_invalid_ids(file_path):
     ranges = read_file_and_turn_to_list(file_path)
     total_invalid_sum = 0
@@ -44,8 +111,7 @@ def sum_invalid_ids(file_path):
     for range_str in ranges:
         start_str, end_str = range_str.split("-")
         start, end = int(start_str), int(end_str)
-        invalid_ids = find_invalid_ids_in_range(start, end)
-        total_invalid_sum += sum(invalid_ids)
+        total_invalid_sum += sum_invalid_ids_in_range(start, end)
 
     return total_invalid_sum
 
@@ -88,6 +154,64 @@ def find_invalid_ids_part2_in_range(start, end):
     return invalid_ids
 
 
+def generate_invalid_ids_part2_in_range(start, end):
+    """
+    Same result as find_invalid_ids_part2_in_range, built from the repeated
+    blocks of every period that divides each digit length. IDs with several
+    periods (111111 is 1 x 6, 11 x 3 and 111 x 2) are only kept once.
+    """
+    invalid_ids = []
+    for length in range(len(str(start)), len(str(end)) + 1):
+        ids_of_length = set()
+        for block_length in range(1, length // 2 + 1):
+            if length % block_length == 0:
+                ids_of_length.update(
+                    repeated_block_ids(start, end, block_length, length // block_length)
+                )
+        invalid_ids.extend(sorted(ids_of_length))
+    return invalid_ids
+
+
+# Summing part 2 in closed form needs inclusion-exclusion: an ID with period
+# p also has every multiple of p dividing its length as a period, so the
+# per-period sums overlap. If g(e) is the sum of IDs of length L with period
+# e (g(L) being every ID of that length), the IDs whose smallest period is L
+# sum to the Mobius sum over e | L of mu(L / e) * g(e). Subtracting those
+# from g(L) leaves the invalid IDs: -mu(L / e) * g(e) over e | L, e < L.
+
+
+def mobius(n):
+    result = 1
+    factor = 2
+    while factor * factor <= n:
+        if n % factor == 0:
+            n //= factor
+            if n % factor == 0:
+                return 0
+            result = -result
+        factor += 1
+    if n > 1:
+        result = -result
+    return result
+
+
+def sum_invalid_ids_part2_in_range(start, end):
+    """
+    Same as sum(find_invalid_ids_part2_in_range(start, end)), in O(digits^2)
+    for arbitrarily large bounds.
+    """
+    total = 0
+    for length in range(len(str(start)), len(str(end)) + 1):
+        for block_length in range(1, length // 2 + 1):
+            if length % block_length == 0:
+                weight = -mobius(length // block_length)
+                if weight:
+                    total += weight * sum_repeated_block_ids(
+                        start, end, block_length, length // block_length
+                    )
+    return total
+
+
 def sum_invalid_ids_part2(file_path):
     ranges = read_file_and_turn_to_list(file_path)
     total_invalid_sum = 0
@@ -95,8 +219,92 @@ def sum_invalid_ids_part2(file_path):
     for range_str in ranges:
         start_str, end_str = range_str.split("-")
         start, end = int(start_str), int(end_str)
-        invalid_ids = find_invalid_ids_part2_in_range(start, end)
-        total_invalid_sum += sum(invalid_ids)
+        total_invalid_sum += sum_invalid_ids_part2_in_range(start, end)
+
+    return total_invalid_sum
+
+
+# For many overlapping queries against the same ID space it is cheaper to
+# build the sorted table of every invalid ID once. With prefix sums over the
+# table, each range query is two bisects and a subtraction.
+
+
+class InvalidIdIndex:
+    def __init__(self, max_digits, ids, part2=False):
+        # ids: sorted array('q') of every invalid ID below 10 ** max_digits
+        self.max_digits = max_digits
+        self.part2 = part2
+        self.ids = ids
+        self.prefix_sums = array("q", [0])
+        self.prefix_sums.extend(accumulate(ids))
+
+    @classmethod
+    def build(cls, max_digits, part2=False):
+        """
+        Builds the table of invalid IDs with up to max_digits digits, using
+        the part 2 definition when part2 is True. IDs and their prefix sums
+        are stored as int64, which the total of the invalid IDs up to 14
+        digits would overflow, so max_digits cannot exceed 13.
+        """
+        if not 1 <= max_digits <= 13:
+            raise ValueError("max_digits must be between 1 and 13")
+
+        end = 10**max_digits - 1
+        ids = array("q")
+        for length in range(1, max_digits + 1):
+            if part2:
+                # Every period's IDs come out as a sorted range, so merging
+                # them drops IDs with several periods as they stream past
+                ranges = [
+                    repeated_block_ids(1, end, block_length, length // block_length)
+                    for block_length in range(1, length // 2 + 1)
+                    if length % block_length == 0
+                ]
+                previous = None
+                for product_id in merge(*ranges):
+                    if product_id != previous:
+                        ids.append(product_id)
+                    previous = product_id
+            elif length % 2 == 0:
+                ids.extend(repeated_block_ids(1, end, length // 2, 2))
+        return cls(max_digits, ids, part2)
+
+    def _bounds(self, start, end):
+        if end >= 10**self.max_digits:
+            raise ValueError(
+                f"Range end {end} exceeds the index limit of {self.max_digits} digits"
+            )
+        return bisect_left(self.ids, start), bisect_right(self.ids, end)
+
+    def count_in_range(self, start, end):
+        lo, hi = self._bounds(start, end)
+        return max(hi - lo, 0)
+
+    def sum_in_range(self, start, end):
+        lo, hi = self._bounds(start, end)
+        return self.prefix_sums[hi] - self.prefix_sums[lo] if hi > lo else 0
+
+    def save(self, file_path):
+        with open(file_path, "wb") as file:
+            array("q", [self.max_digits, int(self.part2)]).tofile(file)
+            self.ids.tofile(file)
+
+    @classmethod
+    def load(cls, file_path):
+        ids = array("q")
+        with open(file_path, "rb") as file:
+            ids.frombytes(file.read())
+        return cls(ids[0], ids[2:], bool(ids[1]))
+
+
+def sum_invalid_ids_with_index(file_path, index):
+    ranges = read_file_and_turn_to_list(file_path)
+    total_invalid_sum = 0
+
+    for range_str in ranges:
+        start_str, end_str = range_str.split("-")
+        start, end = int(start_str), int(end_str)
+        total_invalid_sum += index.sum_in_range(start, end)
 
     return total_invalid_sum
 
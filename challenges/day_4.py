@@ -13,17 +13,52 @@
 # Logic: search for tens digit that isn't the last digit in the line,
 # then find the highest digit after it to form the highest two digit number.
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+def max_subsequence_value(line: str, k: int, debug: bool = False) -> int:
+    """
+    Returns the largest k-digit number formed by digits of line in order.
+
+    A single greedy pass keeps a stack of chosen digits: while a smaller
+    digit sits on top of the stack and there are still digits we can afford
+    to skip, it is replaced by the current, larger digit. This is O(n)
+    regardless of k.
+    """
+    n = len(line)
+    if k < 1:
+        raise ValueError(f"Need to select at least one digit, got k={k}")
+    if n < k:
+        raise ValueError(f"Line too short ({n} digits), need at least {k}: {line}")
+
+    to_drop = n - k
+    stack = []  # indices of the digits kept so far
+    for i, digit in enumerate(line):
+        while to_drop and stack and line[stack[-1]] < digit:
+            stack.pop()
+            to_drop -= 1
+        stack.append(i)
+    chosen = stack[:k]
+
+    if debug:
+        print(f"  Searching best {k}-digit subsequence in: {line}")
+        for idx in chosen:
+            print(f"    Picked digit {line[idx]} at position {idx}")
+
+    joltage = int("".join(line[idx] for idx in chosen))
+    if debug:
+        print(f"  Max joltage for this line: {joltage}")
+    return joltage
+
 
 def search_for_tens_digit_number(line: str) -> int:
-    max_joltage = 0
-    for i in range(len(line) - 1):
-        tens_digit = line[i]
-        for j in range(i + 1, len(line)):
-            units_digit = line[j]
-            joltage = int(tens_digit + units_digit)
-            if joltage > max_joltage:
-                max_joltage = joltage
-    return max_joltage
+    if len(line) < 2:
+        return 0
+    return max_subsequence_value(line, 2)
 
 
 def calculate_total_joltage(file_path: str) -> int:
@@ -61,60 +96,186 @@ if __name__ == "__main__":
 # HOWEVER when it comes to the 12th digit we want to make sure we have the largest possible digit
 
 
-def search_for_twelve_digit_joltage(line: str) -> int:
-    target_len = 12
-    n = len(line)
+def search_for_twelve_digit_joltage(line: str, debug: bool = False) -> int:
+    return max_subsequence_value(line, 12, debug=debug)
 
-    if n < target_len:
-        raise ValueError(
-            f"Line too short ({n} digits), need at least {target_len}: {line}"
-        )
 
-    chosen_digits = []
-    start = 0
-    remaining = target_len
+def calculate_total_twelve_digit_joltage(file_path: str, debug: bool = False) -> int:
+    total_joltage = 0
+    with open(file_path, "r") as file:
+        for line_num, line in enumerate(file, 1):
+            line = line.strip()
+            if line:
+                if debug:
+                    print(f"\nLine {line_num}: {line}")
+                max_joltage = search_for_twelve_digit_joltage(line, debug=debug)
+                total_joltage += max_joltage
+                if debug:
+                    print(f"Running total: {total_joltage}")
+    return total_joltage
 
-    print(f"  Searching best {target_len}-digit subsequence in: {line}")
 
-    while remaining > 0:
-        # Last index we can start from and still have enough digits left
-        end = n - remaining  # inclusive
+# Banks in an input file all have the same width, so the whole file can be
+# treated as a (banks x width) matrix of digits and every bank solved at
+# once. Each digit is encoded as a key digit * width + (width - 1 - position)
+# so that the largest key in a window is its leftmost largest digit, and the
+# key tells us both the digit and where the next window starts.
 
-        # Look at the window line[start : end+1] and pick the largest digit
-        window = line[start : end + 1]
-        max_digit = max(window)
-        # Earliest occurrence of this max digit in the window
-        offset = window.index(max_digit)
-        idx = start + offset
 
-        chosen_digits.append(max_digit)
-        print(
-            f"    Picked digit {max_digit} at position {idx}; "
-            f"window was [{start}:{end + 1}) = {window}"
-        )
+def load_banks(file_path: str) -> "np.ndarray":
+    """
+    Loads a file of equal-width banks as a (banks x width) uint8 matrix.
 
-        # Move start past the chosen index
-        start = idx + 1
-        remaining -= 1
+    Lines are stripped and blank lines skipped, as in the per-line readers.
+    """
+    with open(file_path, "rb") as file:
+        lines = [line.strip() for line in file]
+    lines = [line for line in lines if line]
+    if not lines:
+        raise ValueError("No banks found")
 
-    joltage = int("".join(chosen_digits))
-    print(f"  Max joltage for this line: {joltage}")
-    return joltage
+    width = len(lines[0])
+    if any(len(line) != width for line in lines):
+        raise ValueError("All banks must have the same width")
+
+    chars = np.frombuffer(b"".join(lines), dtype=np.uint8)
+    banks = chars.reshape(-1, width) - ord("0")
+    if np.any(banks > 9):
+        raise ValueError("Banks must only contain digits")
+    return banks
+
+
+def max_subsequence_values(
+    banks: "np.ndarray", k: int, chunk_size: int = 8192
+) -> "np.ndarray":
+    """
+    Vectorized max_subsequence_value for every row of a digit matrix.
 
+    For each of the k picks, a reverse cumulative maximum of the keys over
+    the window every row can still choose from is read at each row's own
+    start position. Rows are processed in chunks, stored column-major, so
+    each step of the running maximum stays in cache.
+    """
+    num_banks, width = banks.shape
+    if not 1 <= k <= 18:
+        raise ValueError(f"k must be between 1 and 18 to fit in int64, got k={k}")
+    if width < k:
+        raise ValueError(f"Banks too short ({width} digits), need at least {k}")
+
+    key_type = np.int16 if 10 * width <= np.iinfo(np.int16).max else np.int32
+    tiebreak = (width - 1 - np.arange(width, dtype=key_type))[:, None]
+    joltages = np.zeros(num_banks, dtype=np.int64)
+
+    for first in range(0, num_banks, chunk_size):
+        chunk = banks[first : first + chunk_size]
+        keys = np.ascontiguousarray(chunk.T.astype(key_type) * width + tiebreak)
+        suffix_max = np.empty_like(keys)
+        columns = np.arange(len(chunk))
+        starts = np.zeros(len(chunk), dtype=np.intp)
+        values = np.zeros(len(chunk), dtype=np.int64)
+
+        for remaining in range(k, 0, -1):
+            window_end = width - remaining + 1  # exclusive
+            suffix_max[window_end - 1] = keys[window_end - 1]
+            for position in range(window_end - 2, starts.min() - 1, -1):
+                np.maximum(
+                    suffix_max[position + 1], keys[position], out=suffix_max[position]
+                )
+            best = suffix_max[starts, columns].astype(np.int64)
+
+            values = values * 10 + best // width
+            starts = width - best % width
+
+        joltages[first : first + chunk_size] = values
+
+    return joltages
+
+
+def calculate_total_joltage_batched(file_path: str, k: int = 12) -> int:
+    """
+    Same as summing max_subsequence_value(line, k) over the file, with all
+    banks solved together when NumPy is available.
+
+    Files the matrix cannot hold (empty, ragged or non-digit lines) and
+    values of k too large for int64 are summed line by line instead.
+    """
+    if HAS_NUMPY and k <= 18:
+        try:
+            banks = load_banks(file_path)
+        except ValueError:
+            banks = None
+        if banks is not None:
+            return sum(max_subsequence_values(banks, k).tolist())
 
-def calculate_total_twelve_digit_joltage(file_path: str) -> int:
     total_joltage = 0
     with open(file_path, "r") as file:
-        for line_num, line in enumerate(file, 1):
+        for line in file:
             line = line.strip()
             if line:
-                print(f"\nLine {line_num}: {line}")
-                max_joltage = search_for_twelve_digit_joltage(line)
-                total_joltage += max_joltage
-                print(f"Running total: {total_joltage}")
+                total_joltage += max_subsequence_value(line, k)
     return total_joltage
 
 
+# To evaluate one bank for many values of k, a sparse table is built once:
+# table[j][i] holds the position of the leftmost largest digit in
+# line[i : i + 2 ** j]. Any window is covered by two overlapping power-of-two
+# blocks, so each greedy pick becomes an O(1) lookup.
+
+
+class BankSparseTable:
+    def __init__(self, line: str):
+        self.line = line
+        level = list(range(len(line)))
+        self.table = [level]
+        span = 1
+        while 2 * span <= len(line):
+            level = [
+                left if line[left] >= line[right] else right
+                for left, right in zip(level, level[span:])
+            ]
+            self.table.append(level)
+            span *= 2
+
+    def leftmost_max(self, lo: int, hi: int) -> int:
+        """Position of the leftmost largest digit in line[lo : hi + 1]."""
+        j = (hi - lo + 1).bit_length() - 1
+        left = self.table[j][lo]
+        right = self.table[j][hi - (1 << j) + 1]
+        if self.line[left] > self.line[right]:
+            return left
+        elif self.line[right] > self.line[left]:
+            return right
+        else:
+            return min(left, right)
+
+    def max_subsequence_value(self, k: int) -> int:
+        n = len(self.line)
+        if k < 1:
+            raise ValueError(f"Need to select at least one digit, got k={k}")
+        if n < k:
+            raise ValueError(
+                f"Line too short ({n} digits), need at least {k}: {self.line}"
+            )
+
+        chosen_digits = []
+        start = 0
+        for remaining in range(k, 0, -1):
+            idx = self.leftmost_max(start, n - remaining)
+            chosen_digits.append(self.line[idx])
+            start = idx + 1
+        return int("".join(chosen_digits))
+
+
+def max_subsequence_values_for_all_k(line: str, max_k: int = 20) -> dict:
+    """
+    Returns {k: max_subsequence_value(line, k)} for every k from 1 to max_k
+    (or the length of the line, if shorter), sharing one sparse table.
+    """
+    table = BankSparseTable(line)
+    largest_k = min(max_k, len(line))
+    return {k: table.max_subsequence_value(k) for k in range(1, largest_k + 1)}
+
+
 if __name__ == "__main__":
     print(
         "The total twelve-digit joltage is:",
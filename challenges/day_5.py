@@ -28,6 +28,17 @@
 # x.x.@@@.x.
 # Consider your complete diagram of the paper roll locations. How many rolls of paper can be accessed by a forklift?
 
+import os
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 
 def parse_input(input):
     grid = []
@@ -36,7 +47,18 @@ def parse_input(input):
     return grid
 
 
-def count_accessible_rolls(grid):
+def count_accessible_rolls(grid, radius=1, threshold=4):
+    """
+    Counts the rolls with fewer than threshold rolls among their neighbours.
+    The default radius of 1 is the eight adjacent positions; larger square
+    neighbourhoods are counted with the summed-area table backend.
+    """
+    if radius != 1:
+        if not HAS_NUMPY:
+            raise RuntimeError("radius != 1 requires NumPy: pip install numpy")
+        occupancy = occupancy_from_grid(grid)
+        return count_accessible_rolls_in_radius(occupancy, radius, threshold)
+
     rows = len(grid)
     cols = len(grid[0])
     accessible_count = 0
@@ -52,7 +74,7 @@ def count_accessible_rolls(grid):
                     if 0 <= nr < rows and 0 <= nc < cols:
                         if grid[nr][nc] == "@":
                             adjacent_rolls += 1
-                if adjacent_rolls < 4:
+                if adjacent_rolls < threshold:
                     accessible_count += 1
 
     return accessible_count
@@ -196,33 +218,415 @@ if __name__ == "__main__":
 # Stop once no more rolls of paper are accessible by a forklift. In this example, a total of 43 rolls of paper can be removed.
 
 
-def remove_accessible_rolls(grid):
+# Rescanning the whole grid every round repeats work for rolls whose
+# neighbourhood did not change. Instead, peel the grid like a k-core: count
+# every roll's neighbours once, and when a roll is removed decrement the
+# counts around it. A roll becomes removable in the round right after its
+# count first drops below 4, so each roll and each of its neighbours is
+# touched a constant number of times.
+
+
+def peel_accessible_rolls(grid, threshold=4):
+    """
+    Simulates the repeated removal of accessible rolls without modifying
+    the grid, where a roll is accessible with fewer than threshold
+    neighbouring rolls.
+
+    Returns:
+    tuple: (total removed, list of removals per round, array('I') of the
+    round in which each cell r * cols + c was removed, 0 if never)
+    """
     rows = len(grid)
     cols = len(grid[0])
+
+    # Pad the grid with a border of empty cells so neighbours need no bounds checks
+    width = cols + 2
+    occupied = bytearray(width * (rows + 2))
+    for r in range(rows):
+        base = (r + 1) * width + 1
+        for c in range(cols):
+            if grid[r][c] == "@":
+                occupied[base + c] = 1
+
+    offsets = [-width - 1, -width, -width + 1, -1, 1, width - 1, width, width + 1]
+    rolls = [i for i, cell in enumerate(occupied) if cell]
+    counts = bytearray(len(occupied))
+    for i in rolls:
+        counts[i] = sum(occupied[i + offset] for offset in offsets)
+
+    waves = array("I", bytes(4 * rows * cols))
+    round_counts = []
+    current = [i for i in rolls if counts[i] < threshold]
+
+    while current:
+        round_number = len(round_counts) + 1
+        round_counts.append(len(current))
+        for i in current:
+            occupied[i] = 0
+            waves[(i // width - 1) * cols + i % width - 1] = round_number
+
+        upcoming = []
+        for i in current:
+            for offset in offsets:
+                neighbour = i + offset
+                if occupied[neighbour]:
+                    counts[neighbour] -= 1
+                    if counts[neighbour] == threshold - 1:
+                        upcoming.append(neighbour)
+        current = upcoming
+
+    return sum(round_counts), round_counts, waves
+
+
+def remove_accessible_rolls(grid, radius=1, threshold=4):
+    if radius != 1:
+        if not HAS_NUMPY:
+            raise RuntimeError("radius != 1 requires NumPy: pip install numpy")
+        occupancy = occupancy_from_grid(grid)
+        total_removed = remove_accessible_rolls_in_radius(occupancy, radius, threshold)
+        for r, c in zip(*np.nonzero(occupancy == 0)):
+            grid[r][c] = "."
+        return total_removed
+
+    cols = len(grid[0])
+    total_removed, _, waves = peel_accessible_rolls(grid, threshold)
+
+    for index, round_number in enumerate(waves):
+        if round_number:
+            grid[index // cols][index % cols] = "."
+
+    return total_removed
+
+
+# With NumPy the map becomes a uint8 occupancy array. Summing the eight
+# shifted slices of a zero-padded copy gives every cell's neighbour count in
+# one vectorized pass, and a single boolean mask selects the accessible rolls.
+
+
+def parse_occupancy(input):
+    """Parses the map into a (rows x cols) uint8 array, 1 where there is a roll."""
+    lines = [line.strip() for line in input.strip().split("\n")]
+    width = len(lines[0])
+    if any(len(line) != width for line in lines):
+        raise ValueError("All rows of the map must have the same width")
+    chars = np.frombuffer("".join(lines).encode("ascii"), dtype=np.uint8)
+    return (chars == ord("@")).astype(np.uint8).reshape(len(lines), width)
+
+
+def count_neighbours(occupancy):
+    rows, cols = occupancy.shape
+    padded = np.pad(occupancy, 1)
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for dr in (0, 1, 2):
+        for dc in (0, 1, 2):
+            if dr != 1 or dc != 1:
+                counts += padded[dr : dr + rows, dc : dc + cols]
+    return counts
+
+
+def accessible_mask(occupancy):
+    return (occupancy == 1) & (count_neighbours(occupancy) < 4)
+
+
+def count_accessible_rolls_vectorized(occupancy):
+    return int(np.count_nonzero(accessible_mask(occupancy)))
+
+
+def remove_accessible_rolls_vectorized(occupancy):
+    """
+    Same as remove_accessible_rolls on an occupancy array, with each round
+    computed by the vectorized neighbour kernel. The array is modified in
+    place.
+    """
     total_removed = 0
+    while True:
+        to_remove = accessible_mask(occupancy)
+        removed = int(np.count_nonzero(to_remove))
+        if not removed:
+            break
+        occupancy[to_remove] = 0
+        total_removed += removed
+    return total_removed
 
-    directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
 
+# A dense binary map also fits in one Python int per row, bit c standing for
+# column c. The eight neighbour planes of a row are its upper, own and lower
+# rows shifted by one column either way, and adding them with a bit-sliced
+# counter (one int per bit of the count) evaluates every cell of the row
+# with a handful of word-wide bitwise operations.
+
+
+class BitGrid:
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.mask = (1 << cols) - 1
+
+    @classmethod
+    def from_grid(cls, grid):
+        rows = []
+        for row in grid:
+            bits = 0
+            for c, cell in enumerate(row):
+                if cell == "@":
+                    bits |= 1 << c
+            rows.append(bits)
+        return cls(rows, len(grid[0]))
+
+    @classmethod
+    def from_text(cls, input):
+        rows = []
+        cols = 0
+        for line in input.strip().split("\n"):
+            line = line.strip()
+            cols = max(cols, len(line))
+            # Reverse so that column 0 ends up in the least significant bit
+            bits = line[::-1].replace("@", "1").replace(".", "0")
+            rows.append(int(bits, 2) if bits else 0)
+        return cls(rows, cols)
+
+    def _neighbour_planes(self, r):
+        above = self.rows[r - 1] if r > 0 else 0
+        below = self.rows[r + 1] if r + 1 < len(self.rows) else 0
+        row = self.rows[r]
+        planes = []
+        for bits in (above, row, below):
+            planes.append((bits << 1) & self.mask)
+            planes.append(bits >> 1)
+        planes.append(above)
+        planes.append(below)
+        return planes
+
+    def accessible_row(self, r):
+        """Bits of the rolls in row r with fewer than four neighbouring rolls."""
+        ones = twos = fours = eights = 0
+        for plane in self._neighbour_planes(r):
+            carry = ones & plane
+            ones ^= plane
+            plane = carry
+            carry = twos & plane
+            twos ^= plane
+            plane = carry
+            carry = fours & plane
+            fours ^= plane
+            eights |= carry
+        return self.rows[r] & ~(fours | eights)
+
+    def count_accessible(self):
+        return sum(self.accessible_row(r).bit_count() for r in range(len(self.rows)))
+
+    def remove_accessible(self):
+        total_removed = 0
+        while True:
+            to_remove = [self.accessible_row(r) for r in range(len(self.rows))]
+            removed = sum(bits.bit_count() for bits in to_remove)
+            if not removed:
+                break
+            for r, bits in enumerate(to_remove):
+                self.rows[r] &= ~bits
+            total_removed += removed
+        return total_removed
+
+
+def count_accessible_rolls_bitboard(grid):
+    return BitGrid.from_grid(grid).count_accessible()
+
+
+def remove_accessible_rolls_bitboard(grid):
+    bit_grid = BitGrid.from_grid(grid)
+    initial_rows = list(bit_grid.rows)
+    total_removed = bit_grid.remove_accessible()
+
+    # Mirror remove_accessible_rolls, which clears removed rolls in the grid
+    for r, (before, after) in enumerate(zip(initial_rows, bit_grid.rows)):
+        removed = before & ~after
+        while removed:
+            lowest = removed & -removed
+            grid[r][lowest.bit_length() - 1] = "."
+            removed ^= lowest
+
+    return total_removed
+
+
+# For radius-r square neighbourhoods, a summed-area table (integral image)
+# of the occupancy gives each cell's neighbourhood total from four lookups,
+# so the cost per cell no longer grows with the radius.
+
+
+def occupancy_from_grid(grid):
+    return np.array([[cell == "@" for cell in row] for row in grid], dtype=np.uint8)
+
+
+def count_neighbours_in_radius(occupancy, radius=1):
+    rows, cols = occupancy.shape
+    size = 2 * radius + 1
+    padded = np.pad(occupancy.astype(np.int32), radius)
+
+    table = np.zeros((rows + size, cols + size), dtype=np.int32)
+    table[1:, 1:] = padded.cumsum(axis=0).cumsum(axis=1)
+
+    window = (
+        table[size:, size:]
+        - table[:-size, size:]
+        - table[size:, :-size]
+        + table[:-size, :-size]
+    )
+    return window - occupancy
+
+
+def count_accessible_rolls_in_radius(occupancy, radius=1, threshold=4):
+    accessible = (occupancy == 1) & (
+        count_neighbours_in_radius(occupancy, radius) < threshold
+    )
+    return int(np.count_nonzero(accessible))
+
+
+def remove_accessible_rolls_in_radius(occupancy, radius=1, threshold=4):
+    """
+    Repeatedly removes the rolls with fewer than threshold rolls within
+    the given radius. The occupancy array is modified in place.
+    """
+    total_removed = 0
     while True:
-        to_remove = []
-        for r in range(rows):
-            for c in range(cols):
-                if grid[r][c] == "@":
-                    adjacent_rolls = 0
-                    for dr, dc in directions:
-                        nr, nc = r + dr, c + dc
-                        if 0 <= nr < rows and 0 <= nc < cols:
-                            if grid[nr][nc] == "@":
-                                adjacent_rolls += 1
-                    if adjacent_rolls < 4:
-                        to_remove.append((r, c))
-
-        if not to_remove:
+        to_remove = (occupancy == 1) & (
+            count_neighbours_in_radius(occupancy, radius) < threshold
+        )
+        removed = int(np.count_nonzero(to_remove))
+        if not removed:
             break
+        occupancy[to_remove] = 0
+        total_removed += removed
+    return total_removed
 
-        for r, c in to_remove:
-            grid[r][c] = "."
-        total_removed += len(to_remove)
+
+# Maps too large to hold in memory are processed straight from the file. The
+# input is memory-mapped and split into bands of rows; each band is loaded
+# together with a one-row halo above and below, which is all the neighbour
+# kernel needs, and bands are handed to a process pool. For the iterative
+# removal, the occupancy lives in a memory-mapped state file. Each band
+# removes rolls until it is locally stable, and a band is revisited only if
+# a neighbouring band changed the boundary row it reads as its halo. The
+# rolls that are left at the global fixed point do not depend on the order
+# of removals, so the total matches remove_accessible_rolls.
+
+
+def map_roll_file(path):
+    """
+    Memory-maps a map file as a read-only (rows x cols) uint8 view of its
+    characters, skipping the line terminators.
+    """
+    with open(path, "rb") as file:
+        first_line = file.readline()
+    cols = len(first_line.rstrip(b"\r\n"))
+    row_stride = len(first_line)
+    size = os.path.getsize(path)
+
+    chars = np.memmap(path, dtype=np.uint8, mode="r")
+    if cols == row_stride:
+        return chars.reshape(1, cols)
+
+    rows = (size + row_stride - cols) // row_stride
+    if size not in (rows * row_stride, rows * row_stride - (row_stride - cols)):
+        raise ValueError("All rows of the map must have the same width")
+    return np.lib.stride_tricks.as_strided(
+        chars, shape=(rows, cols), strides=(row_stride, 1), writeable=False
+    )
+
+
+def band_bounds(rows, band_rows):
+    starts = range(0, rows, band_rows)
+    return [(start, min(start + band_rows, rows)) for start in starts]
+
+
+def count_accessible_in_band(args):
+    path, start, stop = args
+    chars = map_roll_file(path)
+    lo = max(start - 1, 0)
+    hi = min(stop + 1, len(chars))
+
+    occupancy = (chars[lo:hi] == ord("@")).astype(np.uint8)
+    interior = accessible_mask(occupancy)[start - lo : stop - lo]
+    return int(np.count_nonzero(interior))
+
+
+def count_accessible_rolls_tiled(path, band_rows=4096, workers=None):
+    """
+    Same as count_accessible_rolls for the map in a file, computed in row
+    bands across a process pool without loading the whole map.
+    """
+    rows = len(map_roll_file(path))
+    tasks = [(path, start, stop) for start, stop in band_bounds(rows, band_rows)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(count_accessible_in_band, tasks))
+
+
+def peel_band(args):
+    """
+    Removes accessible rolls inside one band of the state file until the
+    band is stable, treating its halo rows as fixed.
+
+    Returns:
+    tuple: (rolls removed, first row changed, last row changed)
+    """
+    state_path, shape, start, stop = args
+    state = np.memmap(state_path, dtype=np.uint8, mode="r+", shape=shape)
+    lo = max(start - 1, 0)
+    hi = min(stop + 1, shape[0])
+
+    occupancy = np.array(state[lo:hi])
+    before = occupancy[start - lo : stop - lo].copy()
+    interior = np.zeros(occupancy.shape, dtype=bool)
+    interior[start - lo : stop - lo] = True
+
+    removed = 0
+    while True:
+        to_remove = accessible_mask(occupancy) & interior
+        count = int(np.count_nonzero(to_remove))
+        if not count:
+            break
+        occupancy[to_remove] = 0
+        removed += count
+
+    after = occupancy[start - lo : stop - lo]
+    state[start:stop] = after
+    state.flush()
+    top_changed = bool(np.any(before[0] != after[0]))
+    bottom_changed = bool(np.any(before[-1] != after[-1]))
+    return removed, top_changed, bottom_changed
+
+
+def remove_accessible_rolls_tiled(path, band_rows=4096, workers=None):
+    """
+    Same as remove_accessible_rolls for the map in a file, computed in row
+    bands across a process pool with the occupancy kept on disk.
+    """
+    chars = map_roll_file(path)
+    shape = chars.shape
+    bands = band_bounds(shape[0], band_rows)
+    total_removed = 0
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        state_path = os.path.join(state_dir, "occupancy.bin")
+        state = np.memmap(state_path, dtype=np.uint8, mode="w+", shape=shape)
+        for start, stop in bands:
+            state[start:stop] = chars[start:stop] == ord("@")
+        state.flush()
+        del state
+
+        dirty = set(range(len(bands)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            while dirty:
+                order = sorted(dirty)
+                tasks = [(state_path, shape, *bands[band]) for band in order]
+                dirty = set()
+                for band, (removed, top_changed, bottom_changed) in zip(
+                    order, executor.map(peel_band, tasks)
+                ):
+                    total_removed += removed
+                    if top_changed and band > 0:
+                        dirty.add(band - 1)
+                    if bottom_changed and band < len(bands) - 1:
+                        dirty.add(band + 1)
 
     return total_removed
 
@@ -27,6 +27,19 @@
 
 # Process the database file from the new inventory management system. How many of the available ingredient IDs are fresh?
 
+import heapq
+import os
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 
 def load_data(path):
     with open(path, "r") as f:
@@ -39,14 +52,111 @@ def load_data(path):
     return fresh_ranges, available_ids
 
 
-def count_fresh_ids(fresh_ranges, available_ids):
+def merge_ranges(fresh_ranges):
+    sorted_ranges = sorted(fresh_ranges, key=lambda x: x[0])
+    merged_ranges = []
+    current_start, current_end = sorted_ranges[0]
+
+    for start, end in sorted_ranges[1:]:
+        if start <= current_end + 1:
+            current_end = max(current_end, end)
+        else:
+            merged_ranges.append((current_start, current_end))
+            current_start, current_end = start, end
+
+    merged_ranges.append((current_start, current_end))
+    return merged_ranges
+
+
+# Once the ranges are merged they are sorted and disjoint, so the only range
+# that can contain an ID is the last one starting at or before it. Keeping
+# the starts and ends in parallel arrays turns membership into one bisect,
+# and numpy.searchsorted does the same for a whole batch of IDs.
+
+
+class IntervalIndex:
+    def __init__(self, merged_ranges):
+        # merged_ranges: sorted, disjoint (start, end) pairs from merge_ranges
+        self.starts = array("q", (start for start, _ in merged_ranges))
+        self.ends = array("q", (end for _, end in merged_ranges))
+
+    @classmethod
+    def from_ranges(cls, fresh_ranges):
+        return cls(merge_ranges(fresh_ranges) if fresh_ranges else [])
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __contains__(self, ingredient_id):
+        i = bisect_right(self.starts, ingredient_id) - 1
+        return i >= 0 and ingredient_id <= self.ends[i]
+
+    def classify(self, ingredient_ids):
+        """Returns a boolean NumPy array marking which IDs are fresh."""
+        ids = np.asarray(ingredient_ids, dtype=np.int64)
+        if not len(self):
+            return np.zeros(ids.shape, dtype=bool)
+
+        starts = np.frombuffer(self.starts, dtype=np.int64)
+        ends = np.frombuffer(self.ends, dtype=np.int64)
+        i = np.searchsorted(starts, ids, side="right") - 1
+        return (i >= 0) & (ids <= ends[np.maximum(i, 0)])
+
+    def count_fresh(self, ingredient_ids):
+        if HAS_NUMPY:
+            return int(np.count_nonzero(self.classify(ingredient_ids)))
+        return sum(1 for ingredient_id in ingredient_ids if ingredient_id in self)
+
+
+# When the available IDs already arrive in sorted order, a single two-pointer
+# sweep against the merged ranges classifies them all in O(IDs + ranges).
+# The IDs are consumed from any iterator, so a sorted feed never has to be
+# materialized.
+
+
+def merge_join_ids(merged_ranges, sorted_ids, collect_fresh=False):
+    """
+    Classifies sorted IDs against sorted, disjoint ranges in one sweep.
+
+    Returns:
+    tuple: (fresh count, spoiled count, list of fresh IDs or None)
+    """
+    ranges = iter(merged_ranges)
+    current = next(ranges, None)
     fresh_count = 0
-    for ingredient_id in available_ids:
-        for start, end in fresh_ranges:
-            if start <= ingredient_id <= end:
-                fresh_count += 1
-                break
-    return fresh_count
+    spoiled_count = 0
+    fresh_ids = [] if collect_fresh else None
+    previous_id = None
+
+    for ingredient_id in sorted_ids:
+        if previous_id is not None and ingredient_id < previous_id:
+            raise ValueError("Available IDs must be sorted for a merge join")
+        previous_id = ingredient_id
+
+        while current is not None and current[1] < ingredient_id:
+            current = next(ranges, None)
+
+        if current is not None and current[0] <= ingredient_id:
+            fresh_count += 1
+            if collect_fresh:
+                fresh_ids.append(ingredient_id)
+        else:
+            spoiled_count += 1
+
+    return fresh_count, spoiled_count, fresh_ids
+
+
+def count_fresh_ids(fresh_ranges, available_ids, sorted_ids=False):
+    """
+    Counts the available IDs that fall in any fresh range. Pass
+    sorted_ids=True when the IDs are in ascending order (any iterable) to
+    use a streaming merge join instead of a per-ID search.
+    """
+    if sorted_ids:
+        merged_ranges = merge_ranges(fresh_ranges) if fresh_ranges else []
+        fresh_count, _, _ = merge_join_ids(merged_ranges, available_ids)
+        return fresh_count
+    return IntervalIndex.from_ranges(fresh_ranges).count_fresh(available_ids)
 
 
 def main():
@@ -74,23 +184,85 @@ if __name__ == "__main__":
 # Process the database file again. How many ingredient IDs are considered to be fresh according to the fresh ingredient ID ranges?
 
 
-def merge_ranges(fresh_ranges):
-    sorted_ranges = sorted(fresh_ranges, key=lambda x: x[0])
-    merged_ranges = []
-    current_start, current_end = sorted_ranges[0]
+# When the fresh ranges change over time, re-sorting and re-merging the full
+# list for every count is wasteful. FreshRangeSet keeps the merged ranges in
+# sorted parallel lists: inserting merges with any overlapping or adjacent
+# ranges, deleting splits the ranges it cuts through, and the number of
+# covered IDs is updated as part of each change.
 
-    for start, end in sorted_ranges[1:]:
-        if start <= current_end + 1:
-            current_end = max(current_end, end)
-        else:
-            merged_ranges.append((current_start, current_end))
-            current_start, current_end = start, end
 
-    merged_ranges.append((current_start, current_end))
-    return merged_ranges
+class FreshRangeSet:
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.total = 0  # number of IDs covered by the ranges
+
+    @classmethod
+    def from_ranges(cls, fresh_ranges):
+        range_set = cls()
+        for start, end in fresh_ranges:
+            range_set.add(start, end)
+        return range_set
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+    def __contains__(self, ingredient_id):
+        i = bisect_right(self.starts, ingredient_id) - 1
+        return i >= 0 and ingredient_id <= self.ends[i]
+
+    def add(self, start, end):
+        if start > end:
+            raise ValueError(f"Invalid range {start}-{end}")
+
+        # Ranges that overlap [start, end] or touch it on either side
+        lo = bisect_left(self.ends, start - 1)
+        hi = bisect_right(self.starts, end + 1)
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+            for i in range(lo, hi):
+                self.total -= self.ends[i] - self.starts[i] + 1
+
+        self.starts[lo:hi] = [start]
+        self.ends[lo:hi] = [end]
+        self.total += end - start + 1
+
+    def remove(self, start, end):
+        if start > end:
+            raise ValueError(f"Invalid range {start}-{end}")
+
+        # Ranges that overlap [start, end]
+        lo = bisect_left(self.ends, start)
+        hi = bisect_right(self.starts, end)
+        if lo >= hi:
+            return
+
+        kept_starts = []
+        kept_ends = []
+        if self.starts[lo] < start:
+            kept_starts.append(self.starts[lo])
+            kept_ends.append(start - 1)
+        if self.ends[hi - 1] > end:
+            kept_starts.append(end + 1)
+            kept_ends.append(self.ends[hi - 1])
+
+        for i in range(lo, hi):
+            self.total -= self.ends[i] - self.starts[i] + 1
+        for kept_start, kept_end in zip(kept_starts, kept_ends):
+            self.total += kept_end - kept_start + 1
+
+        self.starts[lo:hi] = kept_starts
+        self.ends[lo:hi] = kept_ends
 
 
 def count_total_fresh_ids(fresh_ranges):
+    if isinstance(fresh_ranges, FreshRangeSet):
+        return fresh_ranges.total
+
     merged_ranges = merge_ranges(fresh_ranges)
     total_fresh_count = 0
     for start, end in merged_ranges:
@@ -98,6 +270,88 @@ def count_total_fresh_ids(fresh_ranges):
     return total_fresh_count
 
 
+# Range exports too large for memory are merged with an external sort: the
+# ranges are read in chunks, each chunk is sorted and written to a temporary
+# run file of int64 (start, end) pairs, and a k-way heap merge of the runs
+# coalesces overlapping and adjacent ranges as they stream past. Memory is
+# bounded by the chunk size plus one read buffer per run.
+
+
+def iter_fresh_ranges(path):
+    """Yields the (start, end) ranges from the first section of the file."""
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                break
+            start, end = map(int, line.split("-"))
+            yield start, end
+
+
+def write_sorted_runs(fresh_ranges, run_dir, run_size=1_000_000):
+    run_paths = []
+    fresh_ranges = iter(fresh_ranges)
+    while True:
+        chunk = sorted(islice(fresh_ranges, run_size))
+        if not chunk:
+            break
+
+        run = array("q")
+        for start, end in chunk:
+            run.append(start)
+            run.append(end)
+
+        run_path = os.path.join(run_dir, f"run_{len(run_paths)}.bin")
+        with open(run_path, "wb") as f:
+            run.tofile(f)
+        run_paths.append(run_path)
+    return run_paths
+
+
+def read_run(run_path, buffer_pairs=65536):
+    item_size = array("q").itemsize
+    with open(run_path, "rb") as f:
+        while True:
+            data = f.read(2 * item_size * buffer_pairs)
+            if not data:
+                break
+            values = array("q", data)
+            yield from zip(values[::2], values[1::2])
+
+
+def merge_sorted_runs(run_paths):
+    """Yields merged ranges from sorted run files, coalescing as it goes."""
+    current_start = current_end = None
+    for start, end in heapq.merge(*(read_run(run_path) for run_path in run_paths)):
+        if current_start is None:
+            current_start, current_end = start, end
+        elif start <= current_end + 1:
+            current_end = max(current_end, end)
+        else:
+            yield current_start, current_end
+            current_start, current_end = start, end
+
+    if current_start is not None:
+        yield current_start, current_end
+
+
+def iter_merged_ranges_external(path, run_size=1_000_000):
+    """
+    Same ranges as merge_ranges for the file's fresh ranges, produced by an
+    external sort with bounded memory.
+    """
+    with tempfile.TemporaryDirectory() as run_dir:
+        run_paths = write_sorted_runs(iter_fresh_ranges(path), run_dir, run_size)
+        yield from merge_sorted_runs(run_paths)
+
+
+def count_total_fresh_ids_external(path, run_size=1_000_000):
+    total_fresh_count = 0
+    for start, end in iter_merged_ranges_external(path, run_size):
+        total_fresh_count += end - start + 1
+    return total_fresh_count
+
+
 def main():
     fresh_ranges, _ = load_data("data/day_6_input.txt")
     total_fresh_count = count_total_fresh_ids(fresh_ranges)
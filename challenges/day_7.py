@@ -21,6 +21,10 @@
 # Of course, the actual worksheet is much wider. You'll need to make sure to unroll it completely so that you can read the problems clearly.
 
 
+import mmap
+from concurrent.futures import ProcessPoolExecutor
+
+
 def load_data(path):
     with open(path, "r") as f:
         lines = f.readlines()
@@ -64,17 +68,48 @@ def parse_problems(lines):
     return problems
 
 
+# Multiplying many operands left to right grows one big int and multiplies
+# it by a small one at every step, which is quadratic in the result size.
+# Combining neighbours pairwise keeps both sides of each multiplication
+# about the same size, so the big multiplications happen only near the top
+# of the tree.
+
+
+def product_tree(numbers):
+    values = list(numbers)
+    if not values:
+        return 1
+    while len(values) > 1:
+        paired = [values[i] * values[i + 1] for i in range(0, len(values) - 1, 2)]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return values[0]
+
+
+def pairwise_sum(numbers):
+    values = list(numbers)
+    if not values:
+        return 0
+    while len(values) > 1:
+        paired = [values[i] + values[i + 1] for i in range(0, len(values) - 1, 2)]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return values[0]
+
+
+def evaluate_problem(problem):
+    numbers, operation = problem
+    if operation == "+":
+        return pairwise_sum(numbers)
+    elif operation == "*":
+        return product_tree(numbers)
+    return 0
+
+
 def solve_problems(problems):
-    total = 0
-    for numbers, operation in problems:
-        if operation == "+":
-            total += sum(numbers)
-        elif operation == "*":
-            product = 1
-            for number in numbers:
-                product *= number
-            total += product
-    return total
+    return pairwise_sum(evaluate_problem(problem) for problem in problems)
 
 
 def main():
@@ -109,104 +144,186 @@ if __name__ == "__main__":
 # Solve the problems on the math worksheet again. What is the grand total found by adding together all of the answers to the individual problems?
 
 def parse_problems_right_to_left(lines):
-    # Convert lines to a 2D grid of characters
-    # Pad all lines to the same length
+    # Pad all lines to the same length and transpose the worksheet once, so
+    # each column is a string read top to bottom (the operator comes last)
     max_len = max(len(line) for line in lines) if lines else 0
-    grid = []
-    for line in lines:
-        padded_line = line.ljust(max_len)
-        grid.append(list(padded_line))
-    
-    if not grid:
+    if not max_len:
         return []
-    
-    num_rows = len(grid)
-    num_cols = max_len
-    
-    # The last row contains operations
-    operations_row = grid[-1]
-    number_rows = grid[:-1]
-    
+    padded_lines = [line.ljust(max_len) for line in lines]
+    columns = ["".join(column) for column in zip(*padded_lines)]
+
+    # A column of only spaces (operator row included) separates problems
+    is_blank = [not column.strip(" ") for column in columns]
+
     problems = []
-    col = num_cols - 1  # Start from the rightmost column
-    
+    col = max_len - 1  # Start from the rightmost column
+
     while col >= 0:
-        # Skip columns that are all spaces (problem separators)
-        if all(row[col] == ' ' for row in grid):
+        if is_blank[col]:
             col -= 1
             continue
-        
-        # Find the left boundary of this problem
-        problem_start_col = col
-        while problem_start_col >= 0:
-            if all(row[problem_start_col] == ' ' for row in grid):
-                problem_start_col += 1
-                break
-            problem_start_col -= 1
-        if problem_start_col < 0:
-            problem_start_col = 0
-        
-        # Parse numbers from right to left
-        # Key insight: Each column represents one number
-        # Within each column, digits are arranged top to bottom (MSD to LSD)
-        # Read each column from top to bottom to get the digits, forming the number
-        
+
+        # This problem spans the run of non-blank columns ending at col
+        problem_end_col = col
+        while col >= 0 and not is_blank[col]:
+            col -= 1
+        problem_start_col = col + 1
+
+        # Each column is one number, most significant digit at the top;
+        # reading columns right to left gives the numbers in the right order
         numbers = []
-        current_col = col
-        
-        while current_col >= problem_start_col:
-            # Skip if this column is all spaces
-            if all(row[current_col] == ' ' for row in number_rows):
-                current_col -= 1
-                continue
-            
-            # Read this column from top to bottom to extract digits
-            col_digits = []
-            for row in number_rows:
-                char = row[current_col]
-                if char.isdigit():
-                    col_digits.append(char)
-            
-            # If we found digits, form the number
-            if col_digits:
-                # Digits are read top to bottom, which gives MSD to LSD
-                num_str = ''.join(col_digits)
+        for c in range(problem_end_col, problem_start_col - 1, -1):
+            num_str = "".join(char for char in columns[c][:-1] if char.isdigit())
+            if num_str:
                 try:
                     numbers.append(int(num_str))
                 except ValueError:
                     pass
-            
-            current_col -= 1
-        
-        # Get the operation for this problem (look in the operations row)
+
+        # The operation is the first operator in this problem's last row
         operation = None
-        for c in range(problem_start_col, col + 1):
-            op_char = operations_row[c]
-            if op_char in ('+', '*'):
+        for c in range(problem_start_col, problem_end_col + 1):
+            op_char = columns[c][-1]
+            if op_char in ("+", "*"):
                 operation = op_char
                 break
-        
+
         if numbers and operation:
-            # Numbers are collected right to left, which is the correct order
             problems.append((numbers, operation))
-        
-        col = problem_start_col - 1
-    
+
     return problems
 
 
 def solve_problems_right_to_left(problems):
+    return pairwise_sum(evaluate_problem(problem) for problem in problems)
+
+
+# Generated worksheets can be only a few rows tall but hundreds of MB wide.
+# Rather than loading whole lines, the file is memory-mapped and each row is
+# read through its own offset, all rows advancing together one stripe of
+# columns at a time. A problem is emitted as soon as the blank column after
+# it is seen, so memory is bounded by the stripe and the widest problem.
+# Right-to-left mode walks the stripes from the right edge, producing the
+# problems in the same order as parse_problems_right_to_left.
+
+
+def find_row_extents(mm):
+    """Returns (offset, length) of every row in the mapped worksheet."""
+    rows = []
+    start = 0
+    while start < len(mm):
+        end = mm.find(b"\n", start)
+        if end == -1:
+            end = len(mm)
+        length = end - start
+        if length and mm[end - 1 : end] == b"\r":
+            length -= 1
+        rows.append((start, length))
+        start = end + 1
+    return rows
+
+
+def build_problem(columns, right_to_left):
+    """
+    Builds (numbers, operation) from a problem's columns, each given as a
+    tuple of byte values from the top row to the operator row.
+    """
+    if right_to_left:
+        # Columns arrive right to left; each column holds one number
+        numbers = []
+        for column in columns:
+            digits = bytes(byte for byte in column[:-1] if 48 <= byte <= 57)
+            if digits:
+                numbers.append(int(digits))
+        operator_row = bytes(column[-1] for column in reversed(columns))
+    else:
+        # Columns arrive left to right; each row holds one number
+        rows = [bytes(row) for row in zip(*columns)]
+        numbers = [int(row) for row in rows[:-1] if row.strip()]
+        operator_row = rows[-1]
+
+    operation = None
+    for op_char in operator_row.decode("ascii"):
+        if op_char in ("+", "*"):
+            operation = op_char
+            break
+    return numbers, operation
+
+
+def iter_problems_streaming(path, right_to_left=False, stripe_width=1 << 16):
+    """
+    Yields the (numbers, operation) problems of a worksheet file, read in
+    column stripes without loading whole lines. Problems come left to right
+    in the default mode and right to left with right_to_left=True.
+    """
+    with open(path, "rb") as f:
+        size = f.seek(0, 2)
+        if not size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            rows = find_row_extents(mm)
+            width = max(length for _, length in rows)
+            blank_column = (ord(" "),) * len(rows)
+
+            stripes = [
+                (start, min(start + stripe_width, width))
+                for start in range(0, width, stripe_width)
+            ]
+            if right_to_left:
+                stripes.reverse()
+
+            problem_columns = []
+            for stripe_start, stripe_end in stripes:
+                chunks = []
+                for offset, length in rows:
+                    chunk = mm[offset + stripe_start : offset + min(stripe_end, length)]
+                    chunks.append(chunk.ljust(stripe_end - stripe_start))
+
+                columns = list(zip(*chunks))
+                if right_to_left:
+                    columns.reverse()
+
+                for column in columns:
+                    if column != blank_column:
+                        problem_columns.append(column)
+                    elif problem_columns:
+                        numbers, operation = build_problem(
+                            problem_columns, right_to_left
+                        )
+                        if numbers and operation:
+                            yield numbers, operation
+                        problem_columns = []
+
+            if problem_columns:
+                numbers, operation = build_problem(problem_columns, right_to_left)
+                if numbers and operation:
+                    yield numbers, operation
+
+
+def solve_worksheet_streaming(path, right_to_left=False):
     total = 0
-    for numbers, operation in problems:
-        if operation == "+":
-            total += sum(numbers)
-        elif operation == "*":
-            product = 1
-            for number in numbers:
-                product *= number
-            total += product
+    for problem in iter_problems_streaming(path, right_to_left):
+        total += evaluate_problem(problem)
     return total
 
+
+def evaluate_problem_chunk(problems):
+    return pairwise_sum(evaluate_problem(problem) for problem in problems)
+
+
+def solve_problems_parallel(problems, workers=None, chunk_size=64):
+    """
+    Same as solve_problems, with chunks of independent problems evaluated
+    across a process pool and the chunk totals reduced at the end.
+    """
+    problems = list(problems)
+    chunks = [
+        problems[i : i + chunk_size] for i in range(0, len(problems), chunk_size)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return pairwise_sum(executor.map(evaluate_problem_chunk, chunks))
+
+
 def main():
     lines = load_data("data/day_7_input.txt")
     problems = parse_problems_right_to_left(lines)
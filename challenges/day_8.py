@@ -115,6 +115,13 @@
 # Analyze your manifold diagram. How many times will the beam be split?
 
 from collections import Counter
+from math import isqrt
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 def parse_input(input):
     grid = []
@@ -281,60 +288,232 @@ def count_beam_splits(grid):
 def count_timelines(grid):
     rows = len(grid)
     cols = len(grid[0])
-    
-    # Find the starting position 'S' and build splitters map
+
+    # Find the starting position 'S'
     start_row = 0
     start_col = 0
-    splitters = {}  # row -> set of columns with splitters
-    
     for i in range(rows):
         for j in range(cols):
             if grid[i][j] == 'S':
                 start_row = i
                 start_col = j
-            if grid[i][j] == '^':
-                if i not in splitters:
-                    splitters[i] = set()
-                splitters[i].add(j)
-    
-    # Use memoization to cache results
-    # Returns the number of timelines (total paths) reachable from (r, c)
-    from functools import cache
-    
-    @cache
-    def recurse(r: int, c: int) -> int:
-        """Returns the number of timelines (total paths) reachable from (r, c)"""
-        # If we've reached the bottom, this is one timeline
-        if r >= rows:
-            return 1
-        
-        # If there's no splitter at this position, continue straight down
-        if r not in splitters or c not in splitters[r]:
-            return recurse(r + 1, c)
-        
-        # If there is a splitter, split into left and right paths
-        result = 0
-        if c - 1 >= 0:
-            result += recurse(r + 1, c - 1)
-        if c + 1 < cols:
-            result += recurse(r + 1, c + 1)
-        return result
-    
-    # Start from the row below S (since beam moves down from S)
-    return recurse(start_row + 1, start_col)
+
+    # Sweep down one row at a time, carrying the number of timelines that
+    # reach each column. This needs O(cols) memory and no recursion, however
+    # tall the manifold is.
+    timelines = [0] * cols
+    timelines[start_col] = 1
+
+    for r in range(start_row + 1, rows):
+        row = grid[r]
+        if '^' not in row:
+            continue
+
+        next_timelines = [0] * cols
+        for c, count in enumerate(timelines):
+            if not count:
+                continue
+            if row[c] == '^':
+                # A splitter sends every timeline both left and right
+                if c - 1 >= 0:
+                    next_timelines[c - 1] += count
+                if c + 1 < cols:
+                    next_timelines[c + 1] += count
+            else:
+                next_timelines[c] += count
+        timelines = next_timelines
+
+    # Every timeline that leaves the bottom of the manifold is counted once
+    return sum(timelines)
+
+
+# Both answers come out of one top-down sweep that carries the number of
+# timelines reaching each column. A splitter is hit by a classical beam
+# exactly when at least one timeline reaches it, so part 1 counts the
+# splitters with a non-zero incoming count and part 2 sums the counts that
+# leave the bottom. The manifold is kept as one bytes object per row, and
+# only the splitter positions of each row are visited.
+
+
+def parse_manifold(input):
+    return [line.strip().encode("ascii") for line in input.strip().split("\n")]
+
+
+def analyze_manifold(manifold):
+    """
+    Returns (beam splits, timelines) for a manifold from parse_manifold.
+    """
+    cols = len(manifold[0])
+
+    start_row = 0
+    start_col = 0
+    for r, row in enumerate(manifold):
+        c = row.find(b"S")
+        if c != -1:
+            start_row = r
+            start_col = c
+            break
+
+    timelines = [0] * cols
+    timelines[start_col] = 1
+    beam_splits = 0
+
+    for row in manifold[start_row + 1 :]:
+        # Take the incoming counts of every splitter before redistributing,
+        # so a split never feeds a splitter further along the same row
+        incoming = []
+        c = row.find(b"^")
+        while c != -1:
+            if timelines[c]:
+                incoming.append((c, timelines[c]))
+                timelines[c] = 0
+            c = row.find(b"^", c + 1)
+
+        beam_splits += len(incoming)
+        for c, count in incoming:
+            if c - 1 >= 0:
+                timelines[c - 1] += count
+            if c + 1 < cols:
+                timelines[c + 1] += count
+
+    return beam_splits, sum(timelines)
+
+
+# For very wide manifolds each row step becomes a few array operations: take
+# the counts sitting on splitters, clear them, and add them into the columns
+# shifted one to the left and one to the right. Timeline counts grow
+# exponentially with the number of splitter rows, so int64 only lasts so
+# long. Before every step the largest count is checked against a third of
+# the int64 range (a step at most triples a value); past that point the
+# sweep continues either with Python ints in an object array, or with the
+# counts reduced modulo several primes below 2 ** 31 and the exact total
+# rebuilt with the Chinese remainder theorem at the end.
+
+INT64_SAFE_LIMIT = (2**63 - 1) // 3
+
+
+def manifold_array(manifold):
+    width = len(manifold[0])
+    if any(len(row) != width for row in manifold):
+        raise ValueError("All rows of the manifold must have the same width")
+    grid = np.frombuffer(b"".join(manifold), dtype=np.uint8)
+    return grid.reshape(len(manifold), width)
+
+
+def split_row(counts, splitter_mask, moduli=None):
+    """
+    Advances counts (shape (cols,) or (residues, cols)) through one row and
+    returns the number of splitters that were reached.
+    """
+    hits = np.where(splitter_mask, counts, 0)
+    if hits.ndim == 2:
+        reached = np.any(hits != 0, axis=0)
+    else:
+        reached = hits != 0
+
+    counts -= hits
+    counts[..., :-1] += hits[..., 1:]
+    counts[..., 1:] += hits[..., :-1]
+    if moduli is not None:
+        counts %= moduli
+    return int(np.count_nonzero(reached))
+
+
+def largest_primes_below(limit, count):
+    # Sieve the primes up to sqrt(limit) to trial-divide the candidates
+    root = isqrt(limit)
+    is_prime = bytearray([1]) * (root + 1)
+    is_prime[:2] = b"\x00\x00"
+    for p in range(2, isqrt(root) + 1):
+        if is_prime[p]:
+            is_prime[p * p :: p] = bytes(len(range(p * p, root + 1, p)))
+    small_primes = [p for p in range(root + 1) if is_prime[p]]
+
+    primes = []
+    candidate = limit - 1
+    while len(primes) < count:
+        if all(candidate % p for p in small_primes):
+            primes.append(candidate)
+        candidate -= 1
+    return primes
+
+
+def combine_residues(residues, moduli):
+    total = 0
+    product = 1
+    for residue, modulus in zip(residues, moduli):
+        # Lift total so it also matches this residue
+        step = (residue - total) * pow(product, -1, modulus) % modulus
+        total += step * product
+        product *= modulus
+    return total
+
+
+def analyze_manifold_vectorized(manifold, overflow="crt"):
+    """
+    Same result as analyze_manifold, with every row step done with NumPy.
+
+    Parameters:
+    manifold (list): Rows of the manifold as bytes, from parse_manifold.
+    overflow (str): How to continue once counts could overflow int64:
+        "crt" for multi-modulus residues or "object" for Python ints.
+
+    Returns:
+    tuple: (beam splits, timelines)
+    """
+    if overflow not in ("crt", "object"):
+        raise ValueError(f"Unknown overflow strategy: {overflow}")
+
+    grid = manifold_array(manifold)
+    start_rows, start_cols = np.nonzero(grid == ord("S"))
+    start_row = int(start_rows[0]) if len(start_rows) else 0
+    start_col = int(start_cols[0]) if len(start_cols) else 0
+
+    splitters = grid[start_row + 1 :] == ord("^")
+    splitter_rows = splitters[splitters.any(axis=1)]
+
+    counts = np.zeros(grid.shape[1], dtype=np.int64)
+    counts[start_col] = 1
+    beam_splits = 0
+
+    for i, splitter_mask in enumerate(splitter_rows):
+        if counts.max() > INT64_SAFE_LIMIT:
+            remaining_rows = splitter_rows[i:]
+            break
+        beam_splits += split_row(counts, splitter_mask)
+    else:
+        return beam_splits, sum(counts.tolist())
+
+    if overflow == "object":
+        counts = counts.astype(object)
+        for splitter_mask in remaining_rows:
+            beam_splits += split_row(counts, splitter_mask)
+        return beam_splits, sum(counts.tolist())
+
+    # Each splitter row at most doubles the total, which bounds the result
+    bound_bits = sum(counts.tolist()).bit_length() + len(remaining_rows)
+    moduli = largest_primes_below(2**31, bound_bits // 30 + 1)
+    modulus_column = np.array(moduli, dtype=np.int64)[:, None]
+
+    residues = counts[None, :] % modulus_column
+    for splitter_mask in remaining_rows:
+        beam_splits += split_row(residues, splitter_mask, modulus_column)
+
+    totals = [
+        int(total) % modulus for total, modulus in zip(residues.sum(axis=1), moduli)
+    ]
+    return beam_splits, combine_residues(totals, moduli)
+
 
 def main():
     with open("data/day_8_input.txt") as f:
         input_data = f.read()
-    grid = parse_input(input_data)
-    
-    # Part 1
-    result1 = count_beam_splits(grid)
-    print(f"Number of beam splits: {result1}")
-    
-    # Part 2
-    result2 = count_timelines(grid)
-    print(f"Number of timelines: {result2}")
+    manifold = parse_manifold(input_data)
+
+    beam_splits, timelines = analyze_manifold(manifold)
+    print(f"Number of beam splits: {beam_splits}")
+    print(f"Number of timelines: {timelines}")
+
 
 if __name__ == "__main__":
-    main()  
+    main()